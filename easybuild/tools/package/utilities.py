@@ -34,13 +34,12 @@ Various utilities related to packaging support.
 """
 import os
 import tempfile
-import pprint
 
 from easybuild.base import fancylogger
 from easybuild.tools.config import PKG_TOOL_FPM, PKG_TYPE_RPM, Singleton
 from easybuild.tools.config import build_option, get_package_naming_scheme, log_path
 from easybuild.tools.build_log import EasyBuildError
-from easybuild.tools.filetools import change_dir, which
+from easybuild.tools.filetools import which
 from easybuild.tools.package.package_naming_scheme.pns import PackageNamingScheme
 from easybuild.tools.py2vs3 import create_base_metaclass
 from easybuild.tools.run import run_cmd
@@ -49,15 +48,25 @@ from easybuild.tools.utilities import get_subclasses, import_available_modules
 
 _log = fancylogger.getLogger('tools.package')  # pylint: disable=C0103
 
+# cache for available package naming schemes
+# key: name of package naming scheme
+# value: corresponding class
+_avail_pns_cache = {}
+
 
 def avail_package_naming_schemes():
     """
     Returns the list of valed naming schemes
     They are loaded from the easybuild.package.package_naming_scheme namespace
+    (only done once, result is cached)
     """
-    import_available_modules('easybuild.tools.package.package_naming_scheme')
-    class_dict = dict([(x.__name__, x) for x in get_subclasses(PackageNamingScheme)])
-    return class_dict
+    if not _avail_pns_cache:
+        import_available_modules('easybuild.tools.package.package_naming_scheme')
+        _avail_pns_cache.update(dict([(x.__name__, x) for x in get_subclasses(PackageNamingScheme)]))
+    else:
+        _log.debug("Using cached list of available package naming schemes: %s", sorted(_avail_pns_cache.keys()))
+
+    return _avail_pns_cache
 
 
 def package(easyblock):
@@ -82,8 +91,6 @@ def package_with_fpm(easyblock):
     pkgtype = build_option('package_type')
     _log.info("Will be creating %s package(s) in %s", pkgtype, workdir)
 
-    origdir = change_dir(workdir)
-
     package_naming_scheme = ActivePNS()
 
     pkgname = package_naming_scheme.name(easyblock.cfg)
@@ -94,6 +101,8 @@ def package_with_fpm(easyblock):
     cmdlist = [
         PKG_TOOL_FPM,
         '--workdir', workdir,
+        # put package(s) in working directory, so we don't need to change the current working directory
+        '--package', workdir,
         '--name', pkgname,
         '--provides', pkgname,
         '-t', pkgtype,  # target
@@ -118,15 +127,23 @@ def package_with_fpm(easyblock):
 
     deps.extend(easyblock.cfg.dependencies())
 
-    _log.debug("The dependencies to be added to the package are: %s",
-               pprint.pformat([easyblock.toolchain.as_dict()] + easyblock.cfg.dependencies()))
+    # pass list of dependencies as argument to avoid formatting it when debug logging is not enabled
+    _log.debug("The dependencies to be added to the package are: %s", deps)
+
+    # only add each dependency once (same dependency may be listed both as build and runtime dependency),
+    # while retaining the order in which dependencies are listed
+    dep_pkgnames = set()
     for dep in deps:
         if dep.get('external_module', False):
             _log.debug("Skipping dep marked as external module: %s", dep['name'])
         else:
             _log.debug("The dep added looks like %s ", dep)
             dep_pkgname = package_naming_scheme.name(dep)
-            cmdlist.extend(["--depends", dep_pkgname])
+            if dep_pkgname in dep_pkgnames:
+                _log.debug("Skipping duplicate dependency %s", dep_pkgname)
+            else:
+                dep_pkgnames.add(dep_pkgname)
+                cmdlist.extend(["--depends", dep_pkgname])
 
     # Excluding the EasyBuild logs and test reports that might be in the installdir
     exclude_files_globs = [
@@ -141,14 +158,12 @@ def package_with_fpm(easyblock):
         easyblock.installdir,
         easyblock.module_generator.get_module_filepath(),
     ])
-    cmd = ' '.join(cmdlist)
-    _log.debug("The flattened cmdlist looks like: %s", cmd)
+    # command is run as a list of arguments, without involving a shell (so no need to take care of quoting)
+    _log.debug("The cmdlist looks like: %s", cmdlist)
     run_cmd(cmdlist, log_all=True, simple=True, shell=False)
 
     _log.info("Created %s package(s) in %s", pkgtype, workdir)
 
-    change_dir(origdir)
-
     return workdir
 
 
@@ -61,11 +61,11 @@ strictness = WARN
 
 
 CACHED_COMMANDS = [
-    "sysctl -n hw.cpufrequency_max",  # used in get_cpu_speed (OS X)
-    "sysctl -n hw.memsize",  # used in get_total_memory (OS X)
-    "sysctl -n hw.ncpu",  # used in get_avail_core_count (OS X)
-    "sysctl -n machdep.cpu.brand_string",  # used in get_cpu_model (OS X)
-    "sysctl -n machdep.cpu.vendor",  # used in get_cpu_vendor (OS X)
+    "sysctl -n hw.cpufrequency_max",  # fallback in get_sysctl_value, used by get_cpu_speed (OS X)
+    "sysctl -n hw.memsize",  # fallback in get_sysctl_value, used by get_total_memory (OS X)
+    "sysctl -n hw.ncpu",  # fallback in get_sysctl_value, used by get_avail_core_count (OS X)
+    "sysctl -n machdep.cpu.brand_string",  # fallback in get_sysctl_value, used by get_cpu_model (OS X)
+    "sysctl -n machdep.cpu.vendor",  # fallback in get_sysctl_value, used by get_cpu_vendor (OS X)
     "type module",  # used in ModulesTool.check_module_function
     "ulimit -u",  # used in det_parallelism
 ]
@@ -30,6 +30,7 @@ Module with useful functions for getting system information
 """
 import ctypes
 import fcntl
+import functools
 import grp  # @UnresolvedImport
 import os
 import platform
@@ -90,6 +91,7 @@ DARWIN = 'Darwin'
 
 UNKNOWN = 'UNKNOWN'
 
+ETC_OS_RELEASE = '/etc/os-release'
 MAX_FREQ_FP = '/sys/devices/system/cpu/cpu0/cpufreq/scaling_max_freq'
 PROC_CPUINFO_FP = '/proc/cpuinfo'
 PROC_MEMINFO_FP = '/proc/meminfo'
@@ -133,17 +135,86 @@ ARM_CORTEX_IDS = {
     '0xd09': 'Cortex-A73',
 }
 
+# sysctl keys used to query system information on BSD-type systems (incl. macOS)
+SYSCTL_KEYS = [
+    'hw.cpufrequency_max',
+    'hw.memsize',
+    'hw.ncpu',
+    'machdep.cpu.brand_string',
+    'machdep.cpu.extfeatures',
+    'machdep.cpu.features',
+    'machdep.cpu.leaf7_features',
+    'machdep.cpu.vendor',
+]
+
 # OS package handler name constants
 RPM = 'rpm'
 DPKG = 'dpkg'
 
+# regular expressions used to extract CPU vendor/model from /proc/cpuinfo
+CPU_VENDOR_REGEXES = {
+    X86_64: re.compile(r"vendor_id\s+:\s*(\S+)"),
+    POWER: re.compile(r"model\s+:\s*((\w|-)+)"),
+    AARCH32: re.compile(r"CPU implementer\s+:\s*(\S+)"),
+    AARCH64: re.compile(r"CPU implementer\s+:\s*(\S+)"),
+}
+# we need 'model name' on Linux/x86, but 'model' is there first with different info
+# 'model name' is not there for Linux/POWER, but 'model' has the right info
+CPU_MODEL_REGEX = re.compile(r"^model(?:\s+name)?\s+:\s*(?P<model>.*[A-Za-z].+)\s*$", re.M)
+ARM_CPU_PART_REGEX = re.compile(r"CPU part\s+:\s*(\S+)", re.M)
+# 'cpu MHz' on Linux/x86 (& more), 'clock' on Linux/POWER
+CPU_FREQ_REGEX = re.compile(r"^(?:cpu MHz|clock)\s*:\s*(?P<cpu_freq>\d+(?:\.\d+)?)", re.M)
+# 'flags' on Linux/x86, 'Features' on Linux/ARM
+CPU_FLAGS_REGEX = re.compile(r"^(?:flags|[fF]eatures)\s*:\s*(?P<flags>.*)", re.M)
+CPU_ALTIVEC_REGEX = re.compile(r"^cpu\s*:.*altivec supported", re.M)
+CPU_POWER7_REGEX = re.compile(r"^cpu\s*:.*POWER(7|8|9)", re.M)
+
+# regular expressions used to determine CPU architecture/family based on machine type
+AARCH32_REGEX = re.compile("arm.*")
+AARCH64_REGEX = re.compile("aarch64.*")
+POWER_REGEX = re.compile("ppc64.*")
+POWER_LE_REGEX = re.compile(r"^ppc(\d*)le")
+
+# cache for system information that doesn't change during the lifetime of the process
+# key: tuple with function name and (stringified) arguments
+# value: corresponding result
+_system_info_cache = {}
+
 
 class SystemToolsException(Exception):
     """raised when systemtools fails"""
 
 
+def system_info_cache(func):
+    """Function decorator to cache (and retrieve cached) results of functions that query system information."""
+
+    @functools.wraps(func)
+    def cache_aware_func(*args, **kwargs):
+        """Retrieve cached result if available, or determine and cache it."""
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        if key in _system_info_cache:
+            _log.debug("Using cached value for %s: %s", func.__name__, _system_info_cache[key])
+        else:
+            _system_info_cache[key] = func(*args, **kwargs)
+        return _system_info_cache[key]
+
+    return cache_aware_func
+
+
+def reset_system_info_cache():
+    """Reset cache for system information."""
+    _system_info_cache.clear()
+
+
 def sched_getaffinity():
     """Determine list of available cores for current process."""
+    # os.sched_getaffinity is only available in Python 3.3+;
+    # it is preferred since it avoids having to locate & load libc via ctypes (find_library may run external commands)
+    if hasattr(os, 'sched_getaffinity'):
+        avail_cpus = os.sched_getaffinity(0)
+        _log.debug("Available cores for current process according to os.sched_getaffinity: %s", avail_cpus)
+        return [int(cpu in avail_cpus) for cpu in range(max(avail_cpus) + 1)]
+
     cpu_mask_t = ctypes.c_ulong
     cpu_setsize = 1024
     n_cpu_bits = 8 * ctypes.sizeof(cpu_mask_t)
@@ -173,6 +244,61 @@ def sched_getaffinity():
     return cpus
 
 
+@system_info_cache
+def read_proc_cpuinfo():
+    """
+    Read contents of /proc/cpuinfo (only once, result is cached)
+    """
+    return read_file(PROC_CPUINFO_FP)
+
+
+@system_info_cache
+def get_sysctl_values():
+    """
+    Query all sysctl keys we're interested in via a single sysctl command (only done once, result is cached)
+
+    :return: dict with sysctl keys and corresponding values (keys that are not available are not included)
+    """
+    sysctl_values = {}
+
+    cmd = "sysctl %s" % ' '.join(SYSCTL_KEYS)
+    _log.debug("Trying to query sysctl keys via cmd '%s'", cmd)
+    # exit code may be non-zero if some of the keys are not available
+    out, _ = run_cmd(cmd, log_ok=False, force_in_dry_run=True, trace=False, stream_output=False)
+
+    # output lines look like 'hw.ncpu: 4'
+    for line in out.split('\n'):
+        key, sep, value = line.partition(':')
+        key = key.strip()
+        if sep and key in SYSCTL_KEYS:
+            sysctl_values[key] = value.strip()
+
+    _log.debug("Values for sysctl keys: %s", sysctl_values)
+
+    return sysctl_values
+
+
+@system_info_cache
+def get_sysctl_value(key):
+    """
+    Determine value for specified sysctl key
+    (result is cached, also if value could not be determined, to avoid querying unavailable keys over and over again)
+
+    :return: value for specified key (as a string), or None if it could not be determined
+    """
+    value = get_sysctl_values().get(key)
+
+    if value is None:
+        # fall back to querying specified key separately
+        cmd = "sysctl -n %s" % key
+        out, ec = run_cmd(cmd, force_in_dry_run=True, trace=False, stream_output=False)
+        if ec == 0:
+            value = out.strip()
+
+    return value
+
+
+@system_info_cache
 def get_avail_core_count():
     """
     Returns the number of available CPUs, according to cgroups and taskssets limits
@@ -184,12 +310,20 @@ def get_avail_core_count():
         # simple use available sched_getaffinity() function (yields a long, so cast it down to int)
         core_cnt = int(sum(sched_getaffinity()))
     else:
-        # BSD-type systems
-        out, _ = run_cmd('sysctl -n hw.ncpu', force_in_dry_run=True, trace=False, stream_output=False)
+        # BSD-type systems: first try sysconf, which doesn't require running an external command
+        try:
+            out = os.sysconf('SC_NPROCESSORS_ONLN')
+        except (AttributeError, OSError, ValueError) as err:
+            _log.debug("Failed to determine number of online cores via sysconf: %s", err)
+            out = None
+
+        if out is None or out < 1:
+            out = get_sysctl_value('hw.ncpu')
+
         try:
             if int(out) > 0:
                 core_cnt = int(out)
-        except ValueError:
+        except (TypeError, ValueError):
             pass
 
     if core_cnt is None:
@@ -220,11 +354,10 @@ def get_total_memory():
             memtotal = int(mem_mo.group(1)) // 1024
 
     elif os_type == DARWIN:
-        cmd = "sysctl -n hw.memsize"
-        _log.debug("Trying to determine total memory size on Darwin via cmd '%s'", cmd)
-        out, ec = run_cmd(cmd, force_in_dry_run=True, trace=False, stream_output=False)
-        if ec == 0:
-            memtotal = int(out.strip()) // (1024**2)
+        _log.debug("Trying to determine total memory size on Darwin via sysctl key 'hw.memsize'")
+        out = get_sysctl_value('hw.memsize')
+        if out is not None:
+            memtotal = int(out) // (1024**2)
 
     if memtotal is None:
         memtotal = UNKNOWN
@@ -239,20 +372,16 @@ def get_cpu_architecture():
 
     :return: a value from the CPU_ARCHITECTURES list
     """
-    power_regex = re.compile("ppc64.*")
-    aarch64_regex = re.compile("aarch64.*")
-    aarch32_regex = re.compile("arm.*")
-
     system, node, release, version, machine, processor = platform.uname()
 
     arch = UNKNOWN
     if machine == X86_64:
         arch = X86_64
-    elif power_regex.match(machine):
+    elif POWER_REGEX.match(machine):
         arch = POWER
-    elif aarch64_regex.match(machine):
+    elif AARCH64_REGEX.match(machine):
         arch = AARCH64
-    elif aarch32_regex.match(machine):
+    elif AARCH32_REGEX.match(machine):
         arch = AARCH32
 
     if arch == UNKNOWN:
@@ -263,6 +392,7 @@ def get_cpu_architecture():
     return arch
 
 
+@system_info_cache
 def get_cpu_vendor():
     """
     Try to detect the CPU vendor
@@ -273,20 +403,12 @@ def get_cpu_vendor():
     os_type = get_os_type()
 
     if os_type == LINUX:
-        vendor_regex = None
-
-        arch = get_cpu_architecture()
-        if arch == X86_64:
-            vendor_regex = re.compile(r"vendor_id\s+:\s*(\S+)")
-        elif arch == POWER:
-            vendor_regex = re.compile(r"model\s+:\s*((\w|-)+)")
-        elif arch in [AARCH32, AARCH64]:
-            vendor_regex = re.compile(r"CPU implementer\s+:\s*(\S+)")
+        vendor_regex = CPU_VENDOR_REGEXES.get(get_cpu_architecture())
 
         if vendor_regex and is_readable(PROC_CPUINFO_FP):
             vendor_id = None
 
-            proc_cpuinfo = read_file(PROC_CPUINFO_FP)
+            proc_cpuinfo = read_proc_cpuinfo()
             res = vendor_regex.search(proc_cpuinfo)
             if res:
                 vendor_id = res.group(1)
@@ -297,12 +419,10 @@ def get_cpu_vendor():
                            vendor, vendor_regex.pattern, PROC_CPUINFO_FP)
 
     elif os_type == DARWIN:
-        cmd = "sysctl -n machdep.cpu.vendor"
-        out, ec = run_cmd(cmd, force_in_dry_run=True, trace=False, stream_output=False)
-        out = out.strip()
-        if ec == 0 and out in VENDOR_IDS:
+        out = get_sysctl_value('machdep.cpu.vendor')
+        if out in VENDOR_IDS:
             vendor = VENDOR_IDS[out]
-            _log.debug("Determined CPU vendor on DARWIN as being '%s' via cmd '%s" % (vendor, cmd))
+            _log.debug("Determined CPU vendor on DARWIN as being '%s' via sysctl key 'machdep.cpu.vendor'", vendor)
 
     if vendor is None:
         vendor = UNKNOWN
@@ -333,8 +453,7 @@ def get_cpu_family():
 
             # Distinguish POWER running in little-endian mode
             system, node, release, version, machine, processor = platform.uname()
-            powerle_regex = re.compile("^ppc(\d*)le")
-            if powerle_regex.search(machine):
+            if POWER_LE_REGEX.search(machine):
                 family = POWER_LE
 
     if family is None:
@@ -344,6 +463,7 @@ def get_cpu_family():
     return family
 
 
+@system_info_cache
 def get_cpu_model():
     """
     Determine CPU model, e.g., Intel(R) Core(TM) i5-2540M CPU @ 2.60GHz
@@ -352,7 +472,7 @@ def get_cpu_model():
     os_type = get_os_type()
 
     if os_type == LINUX and is_readable(PROC_CPUINFO_FP):
-        proc_cpuinfo = read_file(PROC_CPUINFO_FP)
+        proc_cpuinfo = read_proc_cpuinfo()
 
         arch = get_cpu_architecture()
         if arch in [AARCH32, AARCH64]:
@@ -360,7 +480,7 @@ def get_cpu_model():
             # we can reverse-map the part number.
             vendor = get_cpu_vendor()
             if vendor == ARM:
-                model_regex = re.compile(r"CPU part\s+:\s*(\S+)", re.M)
+                model_regex = ARM_CPU_PART_REGEX
                 # There can be big.LITTLE setups with different types of cores!
                 model_ids = model_regex.findall(proc_cpuinfo)
                 if model_ids:
@@ -371,9 +491,7 @@ def get_cpu_model():
                     _log.debug("Determined CPU model on Linux using regex '%s' in %s: %s",
                                model_regex.pattern, PROC_CPUINFO_FP, model)
         else:
-            # we need 'model name' on Linux/x86, but 'model' is there first with different info
-            # 'model name' is not there for Linux/POWER, but 'model' has the right info
-            model_regex = re.compile(r"^model(?:\s+name)?\s+:\s*(?P<model>.*[A-Za-z].+)\s*$", re.M)
+            model_regex = CPU_MODEL_REGEX
             res = model_regex.search(proc_cpuinfo)
             if res is not None:
                 model = res.group('model').strip()
@@ -381,11 +499,10 @@ def get_cpu_model():
                            model_regex.pattern, PROC_CPUINFO_FP, model)
 
     elif os_type == DARWIN:
-        cmd = "sysctl -n machdep.cpu.brand_string"
-        out, ec = run_cmd(cmd, force_in_dry_run=True, trace=False, stream_output=False)
-        if ec == 0:
-            model = out.strip()
-            _log.debug("Determined CPU model on Darwin using cmd '%s': %s" % (cmd, model))
+        out = get_sysctl_value('machdep.cpu.brand_string')
+        if out is not None:
+            model = out
+            _log.debug("Determined CPU model on Darwin using sysctl key 'machdep.cpu.brand_string': %s", model)
 
     if model is None:
         model = UNKNOWN
@@ -412,9 +529,8 @@ def get_cpu_speed():
         # Linux without cpu scaling
         elif is_readable(PROC_CPUINFO_FP):
             _log.debug("Trying to determine CPU frequency on Linux via %s" % PROC_CPUINFO_FP)
-            proc_cpuinfo = read_file(PROC_CPUINFO_FP)
-            # 'cpu MHz' on Linux/x86 (& more), 'clock' on Linux/POWER
-            cpu_freq_regex = re.compile(r"^(?:cpu MHz|clock)\s*:\s*(?P<cpu_freq>\d+(?:\.\d+)?)", re.M)
+            proc_cpuinfo = read_proc_cpuinfo()
+            cpu_freq_regex = CPU_FREQ_REGEX
             res = cpu_freq_regex.search(proc_cpuinfo)
             if res:
                 cpu_freq = float(res.group('cpu_freq'))
@@ -425,12 +541,11 @@ def get_cpu_speed():
             _log.debug("%s not found to determine max. CPU clock frequency without CPU scaling", PROC_CPUINFO_FP)
 
     elif os_type == DARWIN:
-        cmd = "sysctl -n hw.cpufrequency_max"
-        _log.debug("Trying to determine CPU frequency on Darwin via cmd '%s'" % cmd)
-        out, ec = run_cmd(cmd, force_in_dry_run=True, trace=False, stream_output=False)
-        if ec == 0:
+        _log.debug("Trying to determine CPU frequency on Darwin via sysctl key 'hw.cpufrequency_max'")
+        out = get_sysctl_value('hw.cpufrequency_max')
+        if out is not None:
             # returns clock frequency in cycles/sec, but we want MHz
-            cpu_freq = float(out.strip()) // (1000 ** 2)
+            cpu_freq = float(out) // (1000 ** 2)
 
     else:
         raise SystemToolsException("Could not determine CPU clock frequency (OS: %s)." % os_type)
@@ -448,21 +563,18 @@ def get_cpu_features():
     if os_type == LINUX:
         if is_readable(PROC_CPUINFO_FP):
             _log.debug("Trying to determine CPU features on Linux via %s", PROC_CPUINFO_FP)
-            proc_cpuinfo = read_file(PROC_CPUINFO_FP)
-            # 'flags' on Linux/x86, 'Features' on Linux/ARM
-            flags_regex = re.compile(r"^(?:flags|[fF]eatures)\s*:\s*(?P<flags>.*)", re.M)
+            proc_cpuinfo = read_proc_cpuinfo()
+            flags_regex = CPU_FLAGS_REGEX
             res = flags_regex.search(proc_cpuinfo)
             if res:
                 cpu_feat = sorted(res.group('flags').lower().split())
                 _log.debug("Found CPU features using regex '%s': %s", flags_regex.pattern, cpu_feat)
             elif get_cpu_architecture() == POWER:
                 # for Linux@POWER systems, no flags/features are listed, but we can check for Altivec
-                cpu_altivec_regex = re.compile("^cpu\s*:.*altivec supported", re.M)
-                if cpu_altivec_regex.search(proc_cpuinfo):
+                if CPU_ALTIVEC_REGEX.search(proc_cpuinfo):
                     cpu_feat.append('altivec')
                 # VSX is supported since POWER7
-                cpu_power7_regex = re.compile("^cpu\s*:.*POWER(7|8|9)", re.M)
-                if cpu_power7_regex.search(proc_cpuinfo):
+                if CPU_POWER7_REGEX.search(proc_cpuinfo):
                     cpu_feat.append('vsx')
             else:
                 _log.debug("Failed to determine CPU features from %s", PROC_CPUINFO_FP)
@@ -471,11 +583,11 @@ def get_cpu_features():
 
     elif os_type == DARWIN:
         for feature_set in ['extfeatures', 'features', 'leaf7_features']:
-            cmd = "sysctl -n machdep.cpu.%s" % feature_set
-            _log.debug("Trying to determine CPU features on Darwin via cmd '%s'", cmd)
-            out, ec = run_cmd(cmd, force_in_dry_run=True, trace=False, stream_output=False)
-            if ec == 0:
-                cpu_feat.extend(out.strip().lower().split())
+            key = 'machdep.cpu.%s' % feature_set
+            _log.debug("Trying to determine CPU features on Darwin via sysctl key '%s'", key)
+            out = get_sysctl_value(key)
+            if out is not None:
+                cpu_feat.extend(out.lower().split())
 
         cpu_feat.sort()
 
@@ -499,6 +611,7 @@ def get_os_type():
         raise SystemToolsException("Failed to determine system name using platform.system().")
 
 
+@system_info_cache
 def get_shared_lib_ext():
     """Determine extention for shared libraries
 
@@ -517,6 +630,7 @@ def get_shared_lib_ext():
                                    "unknown system name: %s" % os_type)
 
 
+@system_info_cache
 def get_platform_name(withversion=False):
     """Try and determine platform name
     e.g., x86_64-unknown-linux, x86_64-apple-darwin
@@ -540,6 +654,31 @@ def get_platform_name(withversion=False):
     return platform_name
 
 
+@system_info_cache
+def get_os_release():
+    """
+    Parse /etc/os-release (only done once, result is cached),
+    see https://www.freedesktop.org/software/systemd/man/os-release.html
+
+    :return: dict with keys/values specified in /etc/os-release (empty dict if it's not available)
+    """
+    os_release = {}
+
+    if is_readable(ETC_OS_RELEASE):
+        _log.debug("Parsing %s", ETC_OS_RELEASE)
+        for line in read_file(ETC_OS_RELEASE).split('\n'):
+            line = line.strip()
+            key, sep, value = line.partition('=')
+            if sep and not line.startswith('#'):
+                # values may be enclosed in (single or double) quotes
+                os_release[key.strip()] = value.strip().strip('"\'')
+    else:
+        _log.debug("%s is not available", ETC_OS_RELEASE)
+
+    return os_release
+
+
+@system_info_cache
 def get_os_name():
     """
     Determine system name, e.g., 'redhat' (generic), 'centos', 'debian', 'fedora', 'suse', 'ubuntu',
@@ -558,14 +697,17 @@ def get_os_name():
         # see https://pypi.org/project/distro
         os_name = distro.name()
     else:
-        # no easy way to determine name of Linux distribution
-        os_name = None
+        # fall back to ID specified in /etc/os-release (if available), e.g. 'centos', 'debian', 'rhel', 'sles'
+        os_name = get_os_release().get('ID', '').strip().lower() or None
 
     os_name_map = {
         'red hat enterprise linux server': 'RHEL',
         'red hat enterprise linux': 'RHEL',  # RHEL8 has no server/client
+        'rhel': 'RHEL',  # ID in /etc/os-release
+        'scientific': 'SL',  # ID in /etc/os-release
         'scientific linux sl': 'SL',
         'scientific linux': 'SL',
+        'sles': 'SLES',  # ID in /etc/os-release
         'suse linux enterprise server': 'SLES',
     }
 
@@ -575,6 +717,7 @@ def get_os_name():
         return UNKNOWN
 
 
+@system_info_cache
 def get_os_version():
     """Determine system version."""
 
@@ -584,7 +727,8 @@ def get_os_version():
     elif HAVE_DISTRO:
         os_version = distro.version()
     else:
-        os_version = None
+        # fall back to version specified in /etc/os-release (if available)
+        os_version = get_os_release().get('VERSION_ID')
 
     if os_version:
         if get_os_name() in ["suse", "SLES"]:
@@ -608,8 +752,16 @@ def get_os_version():
                 ],
             }
 
+            # distro and /etc/os-release specify the service pack as minor version (e.g. '12.3' for SLES 12 SP3),
+            # so no need to determine the service pack based on the kernel version in that case
+            if '.' in os_version:
+                major_ver, sp_ver = os_version.split('.', 1)
+                os_version = major_ver
+                if sp_ver != '0':
+                    os_version += '_SP%s' % sp_ver
+
             # append suitable suffix to system version
-            if os_version in version_suffixes.keys():
+            elif os_version in version_suffixes.keys():
                 kernel_version = platform.uname()[2]
                 known_sp = False
                 for (kver, suff) in version_suffixes[os_version]:
@@ -618,9 +770,11 @@ def get_os_version():
                         known_sp = True
                         break
                 if not known_sp:
-                    suff = '_UNKNOWN_SP'
+                    os_version += '_UNKNOWN_SP'
             else:
-                raise EasyBuildError("Don't know how to determine subversions for SLES %s", os_version)
+                # no service pack specified and no kernel version mapping available (e.g. SLES 15 GA),
+                # so just stick to major version
+                _log.debug("Don't know how to determine subversions for SLES %s, so using major version", os_version)
 
         return os_version
     else:
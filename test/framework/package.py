@@ -55,6 +55,8 @@ def verbose(msg):
 
 description, iteration, name, source, target, url, version, workdir = '', '', '', '', '', '', '', ''
 excludes = []
+# like fpm, create package in current working directory, unless --package is used
+pkgdir = os.getcwd()
 
 verbose(' '.join(sys.argv[1:]))
 
@@ -66,6 +68,10 @@ while idx < len(sys.argv):
         workdir = sys.argv[idx]
         verbose('workdir'); verbose(workdir)
 
+    elif sys.argv[idx] == '--package':
+        idx += 1
+        pkgdir = sys.argv[idx]
+
     elif sys.argv[idx] == '--name':
         idx += 1
         name = sys.argv[idx]
@@ -110,7 +116,7 @@ while idx < len(sys.argv):
 
     idx += 1
 
-pkgfile = os.path.join(workdir, name + '-' + version + '.' + iteration + '.' + target)
+pkgfile = os.path.join(pkgdir, name + '-' + version + '.' + iteration + '.' + target)
 
 fp = open(pkgfile, 'w')
 
@@ -160,6 +166,9 @@ class PackageTest(EnhancedTestCase):
         """Test avail_package_naming_schemes()"""
         self.assertEqual(sorted(avail_package_naming_schemes().keys()), ['EasyBuildPNS'])
 
+        # result is cached, so same dict is returned on subsequent calls
+        self.assertTrue(avail_package_naming_schemes() is avail_package_naming_schemes())
+
     def test_check_pkg_support(self):
         """Test check_pkg_support()."""
 
@@ -193,6 +202,31 @@ class PackageTest(EnhancedTestCase):
         self.assertEqual(pns.version(ec), 'eb-%s' % EASYBUILD_VERSION)
         self.assertEqual(pns.release(ec), '1')
 
+    def test_package_deps(self):
+        """Test whether dependencies are passed down correctly to fpm."""
+        init_config(build_options={'silent': True})
+
+        topdir = os.path.dirname(os.path.abspath(__file__))
+        toy_ec = os.path.join(topdir, 'easyconfigs', 'test_ecs', 't', 'toy', 'toy-0.0-gompi-2018a-test.eb')
+        toy_txt = read_file(toy_ec)
+        # GCC is listed both as build and runtime dependency
+        toy_txt += "\nbuilddependencies = [('GCC', '6.4.0-2.28', '', SYSTEM)]"
+        toy_txt += "\ndependencies = [('hwloc', '1.11.8'), ('GCC', '6.4.0-2.28', '', SYSTEM)]"
+        test_ec = os.path.join(self.test_prefix, 'test.eb')
+        write_file(test_ec, toy_txt)
+        ec = EasyConfig(test_ec, validate=False)
+
+        mock_fpm(self.test_prefix)
+
+        # import needs to be done here, since test easyblocks are only included later
+        from easybuild.easyblocks.toy import EB_toy
+        package(EB_toy(ec))
+
+        # each dependency is only passed down once, in the order in which they are listed (toolchain first)
+        fpm_output = read_file(os.path.join(self.test_prefix, FPM_OUTPUT_FILE))
+        depends = re.findall("^got an unhandled option: --depends (.*)$", fpm_output, re.M)
+        self.assertEqual(depends, ['gompi-2018a', 'GCC-6.4.0-2.28', 'hwloc-1.11.8-gompi-2018a'])
+
     def test_package(self):
         """Test package function."""
         build_options = {
@@ -221,7 +255,10 @@ class PackageTest(EnhancedTestCase):
         write_file(reportfile, "I'm a reportfile")
 
         # package using default packaging configuration (FPM to build RPM packages)
+        cwd = os.getcwd()
         pkgdir = package(easyblock)
+        # current working directory is not changed when packaging
+        self.assertTrue(os.path.samefile(os.getcwd(), cwd))
         pkgfile = os.path.join(pkgdir, 'toy-0.0-gompi-2018a-test-eb-%s.1.rpm' % EASYBUILD_VERSION)
 
         fpm_output = read_file(os.path.join(self.test_prefix, FPM_OUTPUT_FILE))
@@ -42,12 +42,13 @@ from easybuild.tools.run import run_cmd
 from easybuild.tools.systemtools import CPU_ARCHITECTURES, AARCH32, AARCH64, POWER, X86_64
 from easybuild.tools.systemtools import CPU_FAMILIES, POWER_LE, DARWIN, LINUX, UNKNOWN
 from easybuild.tools.systemtools import CPU_VENDORS, AMD, APM, ARM, CAVIUM, IBM, INTEL
-from easybuild.tools.systemtools import MAX_FREQ_FP, PROC_CPUINFO_FP, PROC_MEMINFO_FP
+from easybuild.tools.systemtools import ETC_OS_RELEASE, MAX_FREQ_FP, PROC_CPUINFO_FP, PROC_MEMINFO_FP
 from easybuild.tools.systemtools import check_python_version, pick_dep_version
 from easybuild.tools.systemtools import det_parallelism, get_avail_core_count, get_cpu_architecture, get_cpu_family
 from easybuild.tools.systemtools import get_cpu_features, get_cpu_model, get_cpu_speed, get_cpu_vendor
 from easybuild.tools.systemtools import get_gcc_version, get_glibc_version, get_os_type, get_os_name, get_os_version
 from easybuild.tools.systemtools import get_platform_name, get_shared_lib_ext, get_system_info, get_total_memory
+from easybuild.tools.systemtools import reset_system_info_cache
 
 
 PROC_CPUINFO_TXT = None
@@ -274,12 +275,42 @@ DirectMap2M:     2045952 kB
 DirectMap1G:    65011712 kB
 """
 
+ETC_OS_RELEASE_TXT = None
+ETC_OS_RELEASE_TXT_CENTOS = """NAME="CentOS Linux"
+VERSION="7 (Core)"
+ID="centos"
+ID_LIKE="rhel fedora"
+VERSION_ID="7"
+PRETTY_NAME="CentOS Linux 7 (Core)"
+ANSI_COLOR="0;31"
+CPE_NAME="cpe:/o:centos:centos:7"
+HOME_URL="https://www.centos.org/"
+"""
+ETC_OS_RELEASE_TXT_SLES15 = """NAME="SLES"
+VERSION="15"
+VERSION_ID="15"
+PRETTY_NAME="SUSE Linux Enterprise Server 15"
+ID="sles"
+ID_LIKE="suse"
+ANSI_COLOR="0;32"
+CPE_NAME="cpe:/o:suse:sles:15"
+"""
+ETC_OS_RELEASE_TXT_SLES = """NAME="SLES"
+VERSION="12-SP3"
+VERSION_ID="12.3"
+PRETTY_NAME="SUSE Linux Enterprise Server 12 SP3"
+ID="sles"
+ANSI_COLOR="0;32"
+CPE_NAME="cpe:/o:suse:sles:12:sp3"
+"""
+
 MACHINE_NAME = None
 
 
 def mocked_read_file(fp):
     """Mocked version of read_file, with specified contents for known filenames."""
     known_fps = {
+        ETC_OS_RELEASE: ETC_OS_RELEASE_TXT,
         MAX_FREQ_FP:  '2850000',
         PROC_CPUINFO_FP: PROC_CPUINFO_TXT,
         PROC_MEMINFO_FP: PROC_MEMINFO_TXT,
@@ -310,6 +341,10 @@ def mocked_run_cmd(cmd, **kwargs):
         "sysctl -n machdep.cpu.vendor": 'GenuineIntel',
         "ulimit -u": '40',
     }
+    # all sysctl keys can also be queried at once
+    sysctl_lines = ['%s: %s' % (key, known_cmds['sysctl -n %s' % key]) for key in st.SYSCTL_KEYS]
+    known_cmds["sysctl %s" % ' '.join(st.SYSCTL_KEYS)] = '\n'.join(sysctl_lines)
+
     if cmd in known_cmds:
         if 'simple' in kwargs and kwargs['simple']:
             return True
@@ -338,6 +373,10 @@ class SystemToolsTest(EnhancedTestCase):
         self.orig_platform_uname = st.platform.uname
         self.orig_get_tool_version = st.get_tool_version
         self.orig_sys_version_info = st.sys.version_info
+        self.orig_os_sysconf = st.os.sysconf
+        # os.sched_getaffinity is only available in Python 3.3+
+        self.orig_os_sched_getaffinity = getattr(st.os, 'sched_getaffinity', None)
+        reset_system_info_cache()
 
     def tearDown(self):
         """Cleanup after systemtools test."""
@@ -349,6 +388,13 @@ class SystemToolsTest(EnhancedTestCase):
         st.platform.uname = self.orig_platform_uname
         st.get_tool_version = self.orig_get_tool_version
         st.sys.version_info = self.orig_sys_version_info
+        st.os.sysconf = self.orig_os_sysconf
+        if self.orig_os_sched_getaffinity is None:
+            if hasattr(st.os, 'sched_getaffinity'):
+                del st.os.sched_getaffinity
+        else:
+            st.os.sched_getaffinity = self.orig_os_sched_getaffinity
+        reset_system_info_cache()
         super(SystemToolsTest, self).tearDown()
 
     def test_avail_core_count_native(self):
@@ -366,10 +412,32 @@ class SystemToolsTest(EnhancedTestCase):
         self.assertEqual(get_avail_core_count(), 6)
         st.sched_getaffinity = orig_sched_getaffinity
 
+        # os.sched_getaffinity is used if available (sparse set of available cores)
+        reset_system_info_cache()
+        st.os.sched_getaffinity = lambda pid: {0, 2, 5}
+        self.assertEqual(st.sched_getaffinity(), [1, 0, 1, 0, 0, 1])
+        self.assertEqual(get_avail_core_count(), 3)
+
     def test_avail_core_count_darwin(self):
         """Test getting core count (mocked for Darwin)."""
         st.get_os_type = lambda: st.DARWIN
         st.run_cmd = mocked_run_cmd
+        orig_sysconf = st.os.sysconf
+
+        # number of online cores is determined via sysconf (if possible)
+        st.os.sysconf = lambda name: 8 if name == 'SC_NPROCESSORS_ONLN' else orig_sysconf(name)
+        self.assertEqual(get_avail_core_count(), 8)
+
+        # fall back to 'sysctl -n hw.ncpu'
+        reset_system_info_cache()
+
+        def mocked_sysconf(name):
+            """Mocked version of os.sysconf, which doesn't recognize SC_NPROCESSORS_ONLN."""
+            if name == 'SC_NPROCESSORS_ONLN':
+                raise ValueError("unrecognized configuration name")
+            return orig_sysconf(name)
+
+        st.os.sysconf = mocked_sysconf
         self.assertEqual(get_avail_core_count(), 10)
 
     def test_cpu_model_native(self):
@@ -391,17 +459,21 @@ class SystemToolsTest(EnhancedTestCase):
         self.assertEqual(get_cpu_model(), "Intel(R) Xeon(R) CPU E5-2670 0 @ 2.60GHz")
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_AMD
+        reset_system_info_cache()
         self.assertEqual(get_cpu_model(), "Six-Core AMD Opteron(tm) Processor 2427")
 
         MACHINE_NAME = 'ppc64'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_POWER
+        reset_system_info_cache()
         self.assertEqual(get_cpu_model(), "IBM,8205-E6C")
 
         MACHINE_NAME = 'armv7l'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_RASPI2
+        reset_system_info_cache()
         self.assertEqual(get_cpu_model(), "ARM Cortex-A7")
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_ODROID_XU3
+        reset_system_info_cache()
         self.assertEqual(get_cpu_model(), "ARM Cortex-A7 + Cortex-A15")
 
     def test_cpu_model_darwin(self):
@@ -432,10 +504,12 @@ class SystemToolsTest(EnhancedTestCase):
 
         # /proc/cpuinfo on Linux POWER
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_POWER
+        reset_system_info_cache()
         self.assertEqual(get_cpu_speed(), 3550.0)
 
         # Linux (x86) with cpufreq
         st.is_readable = lambda fp: mocked_is_readable(MAX_FREQ_FP, fp)
+        reset_system_info_cache()
         self.assertEqual(get_cpu_speed(), 2850.0)
 
     def test_cpu_speed_darwin(self):
@@ -474,23 +548,28 @@ class SystemToolsTest(EnhancedTestCase):
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_RASPI2
         expected = ['edsp', 'evtstrm', 'fastmult', 'half', 'idiva', 'idivt', 'lpae', 'neon',
                     'thumb', 'tls', 'vfp', 'vfpd32', 'vfpv3', 'vfpv4']
+        reset_system_info_cache()
         self.assertEqual(get_cpu_features(), expected)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_ODROID_XU3
         expected = ['edsp', 'fastmult', 'half', 'idiva', 'idivt', 'neon', 'swp', 'thumb',
                     'tls', 'vfp', 'vfpv3', 'vfpv4']
+        reset_system_info_cache()
         self.assertEqual(get_cpu_features(), expected)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_XGENE2
         expected = ['aes', 'asimd', 'crc32', 'evtstrm', 'fp', 'pmull', 'sha1', 'sha2']
+        reset_system_info_cache()
         self.assertEqual(get_cpu_features(), expected)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_THUNDERX
         expected = ['aes', 'asimd', 'crc32', 'evtstrm', 'fp', 'pmull', 'sha1', 'sha2']
+        reset_system_info_cache()
         self.assertEqual(get_cpu_features(), expected)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_POWER
         st.get_cpu_architecture = lambda: POWER
+        reset_system_info_cache()
         self.assertEqual(get_cpu_features(), ['altivec', 'vsx'])
 
     def test_cpu_features_darwin(self):
@@ -548,21 +627,26 @@ class SystemToolsTest(EnhancedTestCase):
         self.assertEqual(get_cpu_vendor(), INTEL)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_AMD
+        reset_system_info_cache()
         self.assertEqual(get_cpu_vendor(), AMD)
 
         MACHINE_NAME = 'ppc64'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_POWER
+        reset_system_info_cache()
         self.assertEqual(get_cpu_vendor(), IBM)
 
         MACHINE_NAME = 'armv7l'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_RASPI2
+        reset_system_info_cache()
         self.assertEqual(get_cpu_vendor(), ARM)
 
         MACHINE_NAME = 'aarch64'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_XGENE2
+        reset_system_info_cache()
         self.assertEqual(get_cpu_vendor(), APM)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_THUNDERX
+        reset_system_info_cache()
         self.assertEqual(get_cpu_vendor(), CAVIUM)
 
     def test_cpu_vendor_darwin(self):
@@ -591,28 +675,35 @@ class SystemToolsTest(EnhancedTestCase):
         self.assertEqual(get_cpu_family(), INTEL)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_AMD
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), AMD)
 
         MACHINE_NAME = 'armv7l'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_RASPI2
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), ARM)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_ODROID_XU3
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), ARM)
 
         MACHINE_NAME = 'aarch64'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_XGENE2
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), ARM)
 
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_THUNDERX
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), ARM)
 
         MACHINE_NAME = 'ppc64'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_POWER
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), POWER)
 
         MACHINE_NAME = 'ppc64le'
         PROC_CPUINFO_TXT = PROC_CPUINFO_TXT_POWER
+        reset_system_info_cache()
         self.assertEqual(get_cpu_family(), POWER_LE)
 
     def test_cpu_family_darwin(self):
@@ -677,6 +768,77 @@ class SystemToolsTest(EnhancedTestCase):
         os_version = get_os_version()
         self.assertTrue(isinstance(os_version, string_type) or os_version == UNKNOWN)
 
+    def test_os_release(self):
+        """Test determining OS name & version via /etc/os-release (mocked)."""
+        orig_have_distro = st.HAVE_DISTRO
+        orig_platform_attrs = {}
+        for attr in ['dist', 'linux_distribution']:
+            if hasattr(st.platform, attr):
+                orig_platform_attrs[attr] = getattr(st.platform, attr)
+                delattr(st.platform, attr)
+
+        st.HAVE_DISTRO = False
+        st.read_file = mocked_read_file
+        st.is_readable = lambda fp: mocked_is_readable(ETC_OS_RELEASE, fp)
+
+        global ETC_OS_RELEASE_TXT
+
+        ETC_OS_RELEASE_TXT = ETC_OS_RELEASE_TXT_CENTOS
+        self.assertEqual(st.get_os_release()['ID'], 'centos')
+        self.assertEqual(st.get_os_release()['ID_LIKE'], 'rhel fedora')
+        self.assertEqual(get_os_name(), 'centos')
+        self.assertEqual(get_os_version(), '7')
+
+        reset_system_info_cache()
+        ETC_OS_RELEASE_TXT = ETC_OS_RELEASE_TXT_SLES
+        self.assertEqual(get_os_name(), 'SLES')
+        self.assertEqual(get_os_version(), '12_SP3')
+
+        # no service pack in version, and no kernel version mapping available for SLES 15
+        reset_system_info_cache()
+        ETC_OS_RELEASE_TXT = ETC_OS_RELEASE_TXT_SLES15
+        self.assertEqual(get_os_name(), 'SLES')
+        self.assertEqual(get_os_version(), '15')
+
+        # no /etc/os-release available
+        reset_system_info_cache()
+        st.is_readable = lambda _: False
+        self.assertEqual(st.get_os_release(), {})
+        self.assertEqual(get_os_name(), UNKNOWN)
+        self.assertEqual(get_os_version(), UNKNOWN)
+
+        st.HAVE_DISTRO = orig_have_distro
+        for attr in orig_platform_attrs:
+            setattr(st.platform, attr, orig_platform_attrs[attr])
+
+    def test_os_version_sles(self):
+        """Test getting OS version (mocked for SLES)."""
+        orig_get_os_name = st.get_os_name
+        orig_platform_dist = getattr(st.platform, 'dist', None)
+
+        st.get_os_name = lambda: 'SLES'
+        st.platform.dist = lambda: ('SuSE', '11', 'x86_64')
+
+        kernel_version = None
+
+        def mocked_uname_sles():
+            """Mocked version of platform.uname, with specified kernel version."""
+            return ('Linux', 'localhost', kernel_version, '#1 SMP', 'x86_64', 'x86_64')
+
+        st.platform.uname = mocked_uname_sles
+
+        for kernel_version, expected in [('2.6.27.19-5-default', '11'), ('2.6.32.12-0.7-default', '11_SP1'),
+                                         ('3.0.13-0.27-default', '11_SP2'), ('3.0.101-63-default', '11_SP4'),
+                                         ('4.4.21-69-default', '11_UNKNOWN_SP')]:
+            reset_system_info_cache()
+            self.assertEqual(get_os_version(), expected)
+
+        st.get_os_name = orig_get_os_name
+        if orig_platform_dist is None:
+            del st.platform.dist
+        else:
+            st.platform.dist = orig_platform_dist
+
     def test_gcc_version_native(self):
         """Test getting gcc version."""
         gcc_version = get_gcc_version()
@@ -739,6 +901,52 @@ class SystemToolsTest(EnhancedTestCase):
         system_info = get_system_info()
         self.assertTrue(isinstance(system_info, dict))
 
+    def test_sysctl_values(self):
+        """Test querying of sysctl keys (mocked)."""
+        st.run_cmd = mocked_run_cmd
+        sysctl_values = st.get_sysctl_values()
+        self.assertEqual(sorted(sysctl_values.keys()), sorted(st.SYSCTL_KEYS))
+        self.assertEqual(sysctl_values['hw.ncpu'], '10')
+        self.assertEqual(st.get_sysctl_value('machdep.cpu.vendor'), 'GenuineIntel')
+
+        # if batched query doesn't yield value for a particular key, it is queried separately
+        reset_system_info_cache()
+        batch_cmd = "sysctl %s" % ' '.join(st.SYSCTL_KEYS)
+        sysctl_txt = "hw.ncpu: 10\nsysctl: unknown oid 'machdep.cpu.vendor'"
+        st.run_cmd = lambda cmd, **kwargs: (sysctl_txt, 1) if cmd == batch_cmd else mocked_run_cmd(cmd, **kwargs)
+        self.assertEqual(st.get_sysctl_values(), {'hw.ncpu': '10'})
+        self.assertEqual(st.get_sysctl_value('hw.ncpu'), '10')
+        self.assertEqual(st.get_sysctl_value('machdep.cpu.vendor'), 'GenuineIntel')
+
+        # result of separate query is cached, also if no value could be determined
+        st.run_cmd = lambda cmd, **kwargs: ('', 1)
+        self.assertEqual(st.get_sysctl_value('machdep.cpu.vendor'), 'GenuineIntel')
+        self.assertEqual(st.get_sysctl_value('hw.memsize'), None)
+        st.run_cmd = mocked_run_cmd
+        self.assertEqual(st.get_sysctl_value('hw.memsize'), None)
+
+        reset_system_info_cache()
+        self.assertEqual(st.get_sysctl_value('hw.memsize'), '8589934592')
+
+    def test_system_info_cache(self):
+        """Test caching of system information."""
+        st.get_os_type = lambda: st.DARWIN
+        st.run_cmd = mocked_run_cmd
+        run_cmd.clear_cache()
+        self.assertEqual(get_cpu_vendor(), INTEL)
+        self.assertEqual(get_shared_lib_ext(), 'dylib')
+
+        # cached values are retained, even though system information is (mocked to be) different now
+        st.get_os_type = lambda: st.LINUX
+        st.is_readable = lambda _: False
+        self.assertEqual(get_cpu_vendor(), INTEL)
+        self.assertEqual(get_shared_lib_ext(), 'dylib')
+
+        # values are determined again after resetting the cache
+        reset_system_info_cache()
+        self.assertEqual(get_cpu_vendor(), UNKNOWN)
+        self.assertEqual(get_shared_lib_ext(), 'so')
+
     def test_det_parallelism_native(self):
         """Test det_parallelism function (native calls)."""
         self.assertTrue(det_parallelism() > 0)
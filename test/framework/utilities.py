@@ -43,6 +43,7 @@ import easybuild.tools.build_log as eb_build_log
 import easybuild.tools.options as eboptions
 import easybuild.tools.toolchain.utilities as tc_utils
 import easybuild.tools.module_naming_scheme.toolchain as mns_toolchain
+import easybuild.tools.package.utilities as pkg_utils
 from easybuild.framework.easyconfig import easyconfig
 from easybuild.framework.easyblock import EasyBlock
 from easybuild.main import main
@@ -54,6 +55,7 @@ from easybuild.tools.filetools import copy_dir, mkdir, read_file
 from easybuild.tools.modules import curr_module_paths, modules_tool, reset_module_caches
 from easybuild.tools.options import CONFIG_ENV_VAR_PREFIX, EasyBuildOptions, set_tmpdir
 from easybuild.tools.py2vs3 import reload
+from easybuild.tools.systemtools import reset_system_info_cache
 
 
 # make sure tests are robust against any non-default configuration settings;
@@ -413,6 +415,8 @@ def cleanup():
     easyconfig._easyconfig_files_cache.clear()
     easyconfig.get_toolchain_hierarchy.clear()
     mns_toolchain._toolchain_details_cache.clear()
+    pkg_utils._avail_pns_cache.clear()
+    reset_system_info_cache()
 
     # reset to make sure tempfile picks up new temporary directory to use
     tempfile.tempdir = None